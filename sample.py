@@ -12,10 +12,50 @@ If no RTSP URL is provided, it will use a default test stream.
 """
 
 import cv2
+import numpy as np
 import sys
+import threading
 import time
+from queue import Queue, Empty
 from video_import import VideoCapture
 
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+def render_text_tile(text, scale, color, thickness):
+    """Render text once into a small image tile plus a glyph mask.
+
+    Blitting the tile with np.copyto(where=mask) is a plain masked memcpy,
+    so per-frame overlays avoid re-rasterizing the text with cv2.putText.
+    """
+    (w, h), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    tile = np.zeros((h + baseline, max(w, 1), 3), dtype=np.uint8)
+    cv2.putText(tile, text, (0, h), FONT, scale, color, thickness)
+    return tile, tile.any(axis=2, keepdims=True)
+
+def blit_tile(frame, tile, mask, x, y):
+    """Copy a pre-rendered text tile onto the frame at (x, y), clipped."""
+    h = min(tile.shape[0], frame.shape[0] - y)
+    w = min(tile.shape[1], frame.shape[1] - x)
+    if h <= 0 or w <= 0:
+        return
+    np.copyto(frame[y:y + h, x:x + w], tile[:h, :w], where=mask[:h, :w])
+
+def capture_frames(cap, frame_queue, stop_event):
+    """Block on cap.read() in a dedicated thread and hand frames to the
+    display loop via a one-slot queue (newest frame wins), so the main
+    thread only redraws when a frame actually arrived instead of polling."""
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            time.sleep(0.1)
+            continue
+        if frame_queue.full():
+            try:
+                frame_queue.get_nowait()
+            except Empty:
+                pass
+        frame_queue.put(frame)
+
 def main():
     # Default test stream (you can replace with your camera's RTSP URL)
     default_rtsp_url = "rtsp://192.168.29.233"
@@ -34,17 +74,36 @@ def main():
     start_time = time.time()
     last_fps_time = start_time
     last_frame_count = 0
-    
+
+    # Pre-render the overlay glyphs once: the "Frame: " prefix, a fixed-width
+    # strip of digits 0-9, and a cached timestamp tile that is only re-rendered
+    # when the clock string actually changes (once per second).
+    prefix_tile, prefix_mask = render_text_tile("Frame: ", 1, (0, 255, 0), 2)
+    digit_tiles = {d: render_text_tile(d, 1, (0, 255, 0), 2) for d in "0123456789"}
+    digit_width = max(tile.shape[1] for tile, _ in digit_tiles.values())
+    cached_timestamp = None
+    timestamp_tile = timestamp_mask = None
+
+    # Capture in a background thread; the loop below wakes on frame arrival
+    # instead of spinning through waitKey at display speed
+    frame_queue = Queue(maxsize=1)
+    stop_event = threading.Event()
+    reader = threading.Thread(target=capture_frames,
+                              args=(cap, frame_queue, stop_event), daemon=True)
+    reader.start()
+
     try:
         while True:
-            # Read frame - same API as cv2.VideoCapture
-            ret, frame = cap.read()
-            
-            if not ret:
-                print("Failed to read frame, retrying...")
-                time.sleep(0.1)
+            # Wait for the next frame from the capture thread
+            try:
+                frame = frame_queue.get(timeout=0.5)
+            except Empty:
+                # No new frame - just keep the window responsive
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    print("Quitting...")
+                    break
                 continue
-            
+
             frame_count += 1
             current_time = time.time()
             
@@ -59,14 +118,24 @@ def main():
                 last_fps_time = current_time
                 last_frame_count = frame_count
             
-            # Add frame counter overlay
-            cv2.putText(frame, f"Frame: {frame_count}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
-            # Add timestamp
+            # Add frame counter overlay - blit the pre-rendered prefix and
+            # fixed-width digit tiles instead of rasterizing text every frame
+            x = 10
+            blit_tile(frame, prefix_tile, prefix_mask, x, 10)
+            x += prefix_tile.shape[1]
+            for digit in str(frame_count):
+                tile, mask = digit_tiles[digit]
+                blit_tile(frame, tile, mask, x, 10)
+                x += digit_width
+
+            # Add timestamp - only re-render when the string changes
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            cv2.putText(frame, timestamp, (10, frame.shape[0] - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            if timestamp != cached_timestamp:
+                timestamp_tile, timestamp_mask = render_text_tile(
+                    timestamp, 0.5, (255, 255, 255), 1)
+                cached_timestamp = timestamp
+            blit_tile(frame, timestamp_tile, timestamp_mask,
+                      10, frame.shape[0] - 10 - timestamp_tile.shape[0])
             
             # Optional: Add some computer vision processing
             # Uncomment the lines below to see edge detection
@@ -101,6 +170,7 @@ def main():
     
     finally:
         # Clean up
+        stop_event.set()
         cap.release()
         cv2.destroyAllWindows()
         
@@ -71,6 +71,7 @@ func (sm *StreamManager) handleStartStream(c *gin.Context) {
 		RTSPURL  string `json:"rtsp_url" binding:"required"`
 		Width    int    `json:"width"`
 		Height   int    `json:"height"`
+		FPS      int    `json:"fps"`
 	}
 
 	if err := c.ShouldBindJSON(&req); err != nil {
@@ -86,7 +87,20 @@ func (sm *StreamManager) handleStartStream(c *gin.Context) {
 		req.Height = 480
 	}
 
-	err := sm.StartStream(req.StreamID, req.RTSPURL, req.Width, req.Height)
+	// Reuse an existing ingest of the same source at the same output settings
+	// rather than running a second FFmpeg decode of the same camera
+	if existingID, ok := sm.FindStreamByURL(req.RTSPURL, req.Width, req.Height, req.FPS); ok {
+		c.JSON(http.StatusOK, gin.H{
+			"message":   "Stream already running for this RTSP URL",
+			"stream_id": existingID,
+			"rtsp_url":  req.RTSPURL,
+			"width":     req.Width,
+			"height":    req.Height,
+		})
+		return
+	}
+
+	err := sm.StartStream(req.StreamID, req.RTSPURL, req.Width, req.Height, req.FPS)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
 		return
@@ -107,6 +121,7 @@ func (sm *StreamManager) handleStartStreamWithURL(c *gin.Context) {
 		RTSPURL string `json:"rtsp_url" binding:"required"`
 		Width   int    `json:"width"`
 		Height  int    `json:"height"`
+		FPS     int    `json:"fps"`
 	}
 
 	if err := c.ShouldBindJSON(&req); err != nil {
@@ -142,7 +157,7 @@ func (sm *StreamManager) handleStartStreamWithURL(c *gin.Context) {
 	}
 	sm.mu.RUnlock()
 
-	err := sm.StartStream(streamID, req.RTSPURL, req.Width, req.Height)
+	err := sm.StartStream(streamID, req.RTSPURL, req.Width, req.Height, req.FPS)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
 		return
@@ -170,8 +185,9 @@ func (sm *StreamManager) handleStopStream(c *gin.Context) {
 		return
 	}
 
+	// HTTP frame sinks are consumers too, not just WebSocket clients
 	stream.clientsMu.RLock()
-	clientCount := len(stream.clients)
+	clientCount := len(stream.clients) + len(stream.sinks)
 	stream.clientsMu.RUnlock()
 	sm.mu.RUnlock()
 
@@ -246,6 +262,69 @@ func (sm *StreamManager) handleListStreams(c *gin.Context) {
 	c.JSON(http.StatusOK, gin.H{"streams": streams})
 }
 
+// handleStreamFrames streams raw BGR24 frames back-to-back over one
+// long-lived connection, avoiding a request/response round-trip per frame
+// (for Python clients)
+func (sm *StreamManager) handleStreamFrames(c *gin.Context) {
+	streamID := c.Param("streamId")
+
+	sm.mu.RLock()
+	stream, exists := sm.streams[streamID]
+	sm.mu.RUnlock()
+
+	if !exists {
+		c.JSON(http.StatusNotFound, gin.H{"error": "Stream not found"})
+		return
+	}
+
+	// Check if stream is actually running
+	stream.mu.RLock()
+	isRunning := stream.isRunning
+	stream.mu.RUnlock()
+
+	if !isRunning {
+		c.JSON(http.StatusServiceUnavailable, gin.H{"error": "Stream not running"})
+		return
+	}
+
+	sinkID, frames, err := sm.AddFrameSink(streamID)
+	if err != nil {
+		c.JSON(http.StatusNotFound, gin.H{"error": err.Error()})
+		return
+	}
+	defer sm.RemoveFrameSink(streamID, sinkID)
+
+	// Hijack the connection so frames go out as a plain unframed byte stream:
+	// no chunked encoding, and clients read exact width*height*3-byte frames
+	// straight off the socket
+	hijacker, ok := c.Writer.(http.Hijacker)
+	if !ok {
+		c.JSON(http.StatusInternalServerError, gin.H{"error": "Streaming not supported"})
+		return
+	}
+	conn, bufrw, err := hijacker.Hijack()
+	if err != nil {
+		log.Printf("Hijack error for stream %s: %v", streamID, err)
+		return
+	}
+	defer conn.Close()
+
+	bufrw.WriteString("HTTP/1.1 200 OK\r\n" +
+		"Content-Type: application/octet-stream\r\n" +
+		"Connection: close\r\n\r\n")
+	if err := bufrw.Flush(); err != nil {
+		return
+	}
+
+	for frame := range frames {
+		conn.SetWriteDeadline(time.Now().Add(10 * time.Second))
+		if _, err := conn.Write(frame); err != nil {
+			// Client disconnected or stalled
+			return
+		}
+	}
+}
+
 // handleGetFrame returns a single frame from the stream buffer (for Python clients)
 func (sm *StreamManager) handleGetFrame(c *gin.Context) {
 	streamID := c.Param("streamId")
@@ -49,6 +49,7 @@ func main() {
 		api.GET("/streams", sm.handleListStreams)
 		api.GET("/streams/:streamId/stats", sm.handleGetStreamStats)
 		api.GET("/streams/:streamId/frame", sm.handleGetFrame)
+		api.GET("/streams/:streamId/stream", sm.handleStreamFrames)
 	}
 
 	// WebSocket route
@@ -83,6 +84,7 @@ func main() {
 		log.Println("  GET /api/streams - List all streams")
 		log.Println("  GET /api/streams/:streamId/stats - Get stream statistics")
 		log.Println("  GET /api/streams/:streamId/frame - Get latest frame (HTTP)")
+		log.Println("  GET /api/streams/:streamId/stream - Stream raw frames (HTTP, long-lived)")
 		log.Println("  WS /ws/:streamId - WebSocket connection for real-time frames")
 
 		if err := srv.ListenAndServe(); err != nil && err != http.ErrServerClosed {
@@ -6,6 +6,7 @@ import (
 	"fmt"
 	"io"
 	"log"
+	"os"
 	"os/exec"
 	"time"
 
@@ -26,8 +27,9 @@ func (sm *StreamManager) generateClientID() string {
 	return fmt.Sprintf("client_%d", sm.clientIDGen)
 }
 
-// StartStream starts a new RTSP stream ingestion
-func (sm *StreamManager) StartStream(streamID, rtspURL string, width, height int) error {
+// StartStream starts a new RTSP stream ingestion; fps caps the output frame
+// rate (0 means the source rate)
+func (sm *StreamManager) StartStream(streamID, rtspURL string, width, height, fps int) error {
 	sm.mu.Lock()
 	defer sm.mu.Unlock()
 
@@ -40,8 +42,12 @@ func (sm *StreamManager) StartStream(streamID, rtspURL string, width, height int
 	stream := &Stream{
 		rtspURL:        rtspURL,
 		streamID:       streamID,
+		width:          width,
+		height:         height,
+		fps:            fps,
 		frameBuffer:    make(chan []byte, 100), // Buffer up to 100 frames
 		clients:        make(map[string]*Client),
+		sinks:          make(map[uint64]chan []byte),
 		cancelFunc:     cancel,
 		isRunning:      false,
 		healthStopChan: make(chan struct{}),
@@ -50,22 +56,22 @@ func (sm *StreamManager) StartStream(streamID, rtspURL string, width, height int
 	sm.streams[streamID] = stream
 	sm.clients[streamID] = make(map[string]*Client)
 
-	go sm.runFFmpegStream(ctx, stream, width, height)
+	go sm.runFFmpegStream(ctx, stream, width, height, fps)
 	go sm.distributeFrames(stream)
-	go sm.monitorStreamHealth(stream, width, height)
+	go sm.monitorStreamHealth(stream, width, height, fps)
 
 	log.Printf("Started stream %s from %s", streamID, rtspURL)
 	return nil
 }
 
 // runFFmpegStream runs FFmpeg to capture RTSP stream and output raw frames
-func (sm *StreamManager) runFFmpegStream(ctx context.Context, stream *Stream, width, height int) {
+func (sm *StreamManager) runFFmpegStream(ctx context.Context, stream *Stream, width, height, fps int) {
 	for {
 		select {
 		case <-ctx.Done():
 			return
 		default:
-			err := sm.startFFmpeg(ctx, stream, width, height)
+			err := sm.startFFmpeg(ctx, stream, width, height, fps)
 			if err != nil {
 				log.Printf("FFmpeg error for stream %s: %v", stream.streamID, err)
 				time.Sleep(2 * time.Second) // Wait before retry
@@ -75,17 +81,36 @@ func (sm *StreamManager) runFFmpegStream(ctx context.Context, stream *Stream, wi
 }
 
 // startFFmpeg initializes and starts the FFmpeg process for a stream
-func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width, height int) error {
+func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width, height, fps int) error {
 	// FFmpeg command to convert RTSP to raw BGR24 frames
 	args := []string{
 		"-rtsp_transport", "tcp",
+	}
+
+	// Optional hardware-accelerated H.264 decode (e.g. RTSP_HWACCEL=cuda or
+	// vaapi). Decoded frames are downloaded back to system memory for the
+	// rawvideo output, so the rest of the pipeline is unchanged.
+	if hwaccel := os.Getenv("RTSP_HWACCEL"); hwaccel != "" {
+		args = append(args, "-hwaccel", hwaccel)
+	}
+
+	// Drop frames above the requested rate before the scale/convert pass, so
+	// frames nobody will see never cost a swscale run or a trip down the pipe.
+	// fast_bilinear is noticeably cheaper than swscale's default bicubic and
+	// is plenty for monitoring-quality downscales.
+	filter := fmt.Sprintf("scale=%d:%d:flags=fast_bilinear", width, height)
+	if fps > 0 {
+		filter = fmt.Sprintf("fps=%d,%s", fps, filter)
+	}
+
+	args = append(args,
 		"-i", stream.rtspURL,
-		"-vf", fmt.Sprintf("scale=%d:%d", width, height),
+		"-vf", filter,
 		"-f", "rawvideo",
 		"-pix_fmt", "bgr24",
 		"-an", // No audio
 		"-",
-	}
+	)
 
 	cmd := exec.CommandContext(ctx, "ffmpeg", args...)
 	stdout, err := cmd.StdoutPipe()
@@ -118,7 +143,6 @@ func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width,
 
 	// Read frames from stdout
 	frameSize := width * height * 3 // BGR24 = 3 bytes per pixel
-	frameData := make([]byte, frameSize)
 
 	for {
 		select {
@@ -126,7 +150,12 @@ func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width,
 			cmd.Process.Kill()
 			return nil
 		default:
-			_, err := io.ReadFull(stdout, frameData)
+			// Read directly into the buffer that gets published; frames are
+			// shared with every client once they enter the channel, so each
+			// one needs its own allocation, but the old scratch-buffer-then-
+			// copy pattern cost an extra full-frame memcpy per frame.
+			frame := make([]byte, frameSize)
+			_, err := io.ReadFull(stdout, frame)
 			if err != nil {
 				if err != io.EOF {
 					log.Printf("Error reading frame from stream %s: %v", stream.streamID, err)
@@ -134,10 +163,6 @@ func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width,
 				return err
 			}
 
-			// Create frame with metadata
-			frame := make([]byte, len(frameData))
-			copy(frame, frameData)
-
 			// Improved buffer: drop oldest frame if full
 			select {
 			case stream.frameBuffer <- frame:
@@ -166,14 +191,46 @@ func (sm *StreamManager) startFFmpeg(ctx context.Context, stream *Stream, width,
 func (sm *StreamManager) distributeFrames(stream *Stream) {
 	defer log.Printf("Frame distribution stopped for stream %s", stream.streamID)
 
+	// Close streaming sinks only once the frame buffer is drained, so this
+	// goroutine remains the sole sender and closer of sink channels
+	defer func() {
+		stream.clientsMu.Lock()
+		for sinkID, sink := range stream.sinks {
+			delete(stream.sinks, sinkID)
+			close(sink)
+		}
+		stream.clientsMu.Unlock()
+	}()
+
+	// Snapshot of the client and sink sets, rebuilt only when consumers are
+	// added or removed instead of allocating fresh slices on every frame.
+	var clients []*Client
+	var sinks []chan []byte
+	var snapshotVersion uint64
+
 	for frame := range stream.frameBuffer {
 		stream.clientsMu.RLock()
-		clients := make([]*Client, 0, len(stream.clients))
-		for _, client := range stream.clients {
-			clients = append(clients, client)
+		if clients == nil || stream.clientsVersion != snapshotVersion {
+			clients = make([]*Client, 0, len(stream.clients))
+			for _, client := range stream.clients {
+				clients = append(clients, client)
+			}
+			sinks = make([]chan []byte, 0, len(stream.sinks))
+			for _, sink := range stream.sinks {
+				sinks = append(sinks, sink)
+			}
+			snapshotVersion = stream.clientsVersion
 		}
 		stream.clientsMu.RUnlock()
 
+		// Send frame to HTTP streaming sinks, dropping when a sink is slow
+		for _, sink := range sinks {
+			select {
+			case sink <- frame:
+			default:
+			}
+		}
+
 		// Send frame to all clients
 		for _, client := range clients {
 			// Check if client is still active before sending
@@ -191,6 +248,65 @@ func (sm *StreamManager) distributeFrames(stream *Stream) {
 	}
 }
 
+// AddFrameSink registers a raw-frame channel on a stream for HTTP streaming
+// consumers and returns its ID along with the channel
+func (sm *StreamManager) AddFrameSink(streamID string) (uint64, chan []byte, error) {
+	sm.mu.RLock()
+	stream, exists := sm.streams[streamID]
+	sm.mu.RUnlock()
+
+	if !exists {
+		return 0, nil, fmt.Errorf("stream %s not found", streamID)
+	}
+
+	sink := make(chan []byte, 4)
+
+	stream.clientsMu.Lock()
+	stream.sinkIDGen++
+	sinkID := stream.sinkIDGen
+	stream.sinks[sinkID] = sink
+	stream.clientsVersion++
+	stream.clientsMu.Unlock()
+
+	return sinkID, sink, nil
+}
+
+// RemoveFrameSink unregisters a frame sink; it is safe to call after the
+// stream has been stopped
+func (sm *StreamManager) RemoveFrameSink(streamID string, sinkID uint64) {
+	sm.mu.RLock()
+	stream, exists := sm.streams[streamID]
+	sm.mu.RUnlock()
+
+	if !exists {
+		return
+	}
+
+	// Only unregister here; the channel is closed by distributeFrames (the
+	// sole sender) when the stream shuts down, never by the reader side
+	stream.clientsMu.Lock()
+	if _, ok := stream.sinks[sinkID]; ok {
+		delete(stream.sinks, sinkID)
+		stream.clientsVersion++
+	}
+	stream.clientsMu.Unlock()
+}
+
+// FindStreamByURL returns the ID of a stream already ingesting the given RTSP
+// URL with the same output settings, so callers can share its decode pipeline
+// instead of starting a duplicate FFmpeg process
+func (sm *StreamManager) FindStreamByURL(rtspURL string, width, height, fps int) (string, bool) {
+	sm.mu.RLock()
+	defer sm.mu.RUnlock()
+
+	for streamID, stream := range sm.streams {
+		if stream.rtspURL == rtspURL && stream.width == width && stream.height == height && stream.fps == fps {
+			return streamID, true
+		}
+	}
+	return "", false
+}
+
 // StopStream stops a running stream
 func (sm *StreamManager) StopStream(streamID string) error {
 	sm.mu.Lock()
@@ -254,6 +370,7 @@ func (sm *StreamManager) AddClient(streamID string, conn *websocket.Conn) (*Clie
 
 	stream.clientsMu.Lock()
 	stream.clients[clientID] = client
+	stream.clientsVersion++
 	stream.clientsMu.Unlock()
 
 	sm.clients[streamID][clientID] = client
@@ -282,6 +399,7 @@ func (sm *StreamManager) RemoveClient(client *Client) {
 	if stream, exists := sm.streams[client.streamID]; exists {
 		stream.clientsMu.Lock()
 		delete(stream.clients, client.id)
+		stream.clientsVersion++
 		stream.clientsMu.Unlock()
 
 		// Auto-cleanup: if no clients left, optionally stop the stream
@@ -333,7 +451,7 @@ func (sm *StreamManager) GetStreamStats(streamID string) (map[string]interface{}
 }
 
 // monitorStreamHealth checks if frames are being received and restarts FFmpeg if stalled
-func (sm *StreamManager) monitorStreamHealth(stream *Stream, width, height int) {
+func (sm *StreamManager) monitorStreamHealth(stream *Stream, width, height, fps int) {
 	const healthCheckInterval = 5 * time.Second
 	const maxStallDuration = 10 * time.Second
 	ticker := time.NewTicker(healthCheckInterval)
@@ -357,7 +475,7 @@ func (sm *StreamManager) monitorStreamHealth(stream *Stream, width, height int)
 				stream.cancelFunc = cancel
 				stream.isRunning = false
 				stream.mu.Unlock()
-				go sm.runFFmpegStream(ctx, stream, width, height)
+				go sm.runFFmpegStream(ctx, stream, width, height, fps)
 			}
 		}
 	}
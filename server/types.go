@@ -21,10 +21,16 @@ type StreamManager struct {
 type Stream struct {
 	rtspURL        string
 	streamID       string
+	width          int
+	height         int
+	fps            int
 	cmd            *exec.Cmd
 	frameBuffer    chan []byte
 	clients        map[string]*Client
+	sinks          map[uint64]chan []byte
+	sinkIDGen      uint64
 	clientsMu      sync.RWMutex
+	clientsVersion uint64
 	isRunning      bool
 	cancelFunc     context.CancelFunc
 	lastFrameTime  time.Time
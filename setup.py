@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""Builds the optional _frameio Cython extension used by video_import.
+
+Usage:
+    python setup.py build_ext --inplace
+
+Everything works without it; video_import just falls back to its pure-Python
+read loop.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="rtsp-stream-client",
+    ext_modules=cythonize("_frameio.pyx"),
+)
@@ -6,38 +6,472 @@ Just import this function and use it exactly like cv2.VideoCapture
 
 import cv2
 import numpy as np
+import re
 import requests
+import selectors
+import socket
 import time
 import threading
-from queue import Queue, Empty
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+import functools
 import hashlib
+import heapq
 import logging
 
+try:
+    import orjson
+except ImportError:
+    # Optional: the stdlib json in requests works fine, orjson just skips the
+    # pure-Python encode/decode on the startup path
+    orjson = None
+
+try:
+    from _frameio import read_frame_into as _read_frame_into
+except ImportError:
+    # Optional C extension (python setup.py build_ext --inplace): fills a
+    # whole frame buffer with read(2) calls while the GIL is released
+    _read_frame_into = None
+
 # Set up logging
 logging.basicConfig(level=logging.WARNING)  # Only show warnings/errors
 logger = logging.getLogger(__name__)
 
+# cv2.CAP_PROP_* constants resolved exactly once at import; everything below
+# (and any future hot path) works with these plain ints instead of repeating
+# the LOAD_GLOBAL cv2 / LOAD_ATTR pair
+_CAP_FRAME_WIDTH = cv2.CAP_PROP_FRAME_WIDTH
+_CAP_FRAME_HEIGHT = cv2.CAP_PROP_FRAME_HEIGHT
+_CAP_FPS = cv2.CAP_PROP_FPS
+_CAP_BUFFERSIZE = cv2.CAP_PROP_BUFFERSIZE
+_CAP_FRAME_COUNT = cv2.CAP_PROP_FRAME_COUNT
+_CAP_FOURCC = cv2.CAP_PROP_FOURCC
+_CAP_FORMAT = cv2.CAP_PROP_FORMAT
+_CAP_CONVERT_RGB = cv2.CAP_PROP_CONVERT_RGB
+_CAP_ZOOM = cv2.CAP_PROP_ZOOM
+_CAP_BRIGHTNESS = cv2.CAP_PROP_BRIGHTNESS
+_CAP_CONTRAST = cv2.CAP_PROP_CONTRAST
+_CAP_SATURATION = cv2.CAP_PROP_SATURATION
+_CAP_HUE = cv2.CAP_PROP_HUE
+_CAP_GAIN = cv2.CAP_PROP_GAIN
+_CAP_EXPOSURE = cv2.CAP_PROP_EXPOSURE
+_CAP_WB_BLUE_U = cv2.CAP_PROP_WHITE_BALANCE_BLUE_U
+_CAP_WB_RED_V = cv2.CAP_PROP_WHITE_BALANCE_RED_V
+_CAP_FOCUS = cv2.CAP_PROP_FOCUS
+_CAP_PAN = cv2.CAP_PROP_PAN
+_CAP_TILT = cv2.CAP_PROP_TILT
+_CAP_ROLL = cv2.CAP_PROP_ROLL
+_CAP_IRIS = cv2.CAP_PROP_IRIS
+
+# Property dispatch tables, built once at import so get()/set() are a single
+# dict/set lookup instead of a long elif chain re-resolving cv2.CAP_PROP_*
+# attributes on every call. Properties not listed report 0.0 / fail the set,
+# which matches how cv2.VideoCapture treats unsupported properties.
+_PROP_GETTERS = {
+    _CAP_FRAME_WIDTH: lambda self: float(self.width),
+    _CAP_FRAME_HEIGHT: lambda self: float(self.height),
+    _CAP_FPS: lambda self: 30.0,  # Default FPS
+    _CAP_BUFFERSIZE: lambda self: 1.0,  # Single latest-frame slot
+    _CAP_FRAME_COUNT: lambda self: -1.0,  # Infinite for live stream
+    _CAP_FOURCC: lambda self: cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'),
+    _CAP_FORMAT: lambda self: 16.0,  # CV_8UC3
+    _CAP_CONVERT_RGB: lambda self: 1.0,  # We provide RGB frames
+    _CAP_ZOOM: lambda self: 1.0,
+}
+
+# Properties we accept (but can't actually forward to the server-side stream),
+# kept for cv2.VideoCapture compatibility; everything else fails the set
+_SETTABLE_PROPS = {
+    _CAP_BUFFERSIZE,  # Fixed single-slot buffer, accepted as a no-op
+    _CAP_FPS,
+    _CAP_FOURCC,
+    _CAP_CONVERT_RGB,
+    # Camera control properties
+    _CAP_BRIGHTNESS,
+    _CAP_CONTRAST,
+    _CAP_SATURATION,
+    _CAP_HUE,
+    _CAP_GAIN,
+    _CAP_EXPOSURE,
+    _CAP_WB_BLUE_U,
+    _CAP_WB_RED_V,
+    _CAP_ZOOM,
+    _CAP_FOCUS,
+    _CAP_PAN,
+    _CAP_TILT,
+    _CAP_ROLL,
+    _CAP_IRIS,
+}
+
+@functools.lru_cache(maxsize=512)
+def _stream_id_for(rtsp_url):
+    """Derive the default stream ID for an RTSP URL (memoized per URL)
+
+    This is a stable identifier, not a security boundary, so BLAKE2b with an
+    8-byte digest (a single compression call) beats MD5, and repeated captures
+    of the same URL become a dict lookup. The server's response overrides this
+    value on a successful start anyway.
+    """
+    return "stream_" + hashlib.blake2b(rtsp_url.encode(), digest_size=8).hexdigest()
+
+class _TunedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that disables Nagle and enables TCP keep-alive
+
+    TCP_NODELAY keeps the small control requests (and the first bytes of each
+    frame) from being delayed by Nagle's algorithm, and SO_KEEPALIVE protects
+    the long-lived frame streaming connection.
+    """
+
+    _SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self._SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+class _HubStream:
+    """Per-stream connection state tracked by _FetchHub"""
+
+    def __init__(self, capture, host, port, path):
+        self.capture = capture
+        self.host = host
+        self.port = port
+        self.path = path
+        self.sock = None
+        self.state = 'idle'
+        self.header_buf = b''
+        self.views = tuple(memoryview(buf).cast('B') for buf in capture._frame_bufs)
+        self.frame_size = capture.width * capture.height * 3
+        self.write_idx = 0
+        self.offset = 0
+        self.backoff = 0.05
+        self.retry_at = 0.0
+        self.closed = False
+
+class _FetchHub:
+    """Single background thread multiplexing every capture's frame stream
+
+    One capture per camera used to mean one OS thread parked in a blocking
+    read - megabytes of stack apiece and constant GIL churn with many
+    cameras. The hub keeps one non-blocking socket per stream and services
+    them all from one selectors loop, speaking just enough HTTP/1.1 for the
+    server's hijacked /stream endpoint: read the response headers, then the
+    body is raw BGR24 frames back-to-back. Captures on non-http servers fall
+    back to their own fetch thread.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """Return the process-wide hub, starting its thread on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._streams = {}  # capture -> _HubStream
+        self._pending = []  # (item, add) handed off to the hub thread
+        self._lock = threading.Lock()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def register(self, capture):
+        """Multiplex the capture's stream; False if it needs its own thread"""
+        parsed = urlparse(capture.server_url)
+        if parsed.scheme != 'http':
+            return False
+        stream = _HubStream(capture, parsed.hostname or 'localhost',
+                            parsed.port or 80,
+                            f"/api/streams/{capture.stream_id}/stream")
+        with self._lock:
+            self._pending.append((stream, True))
+        self._wake()
+        return True
+
+    def unregister(self, capture):
+        with self._lock:
+            self._pending.append((capture, False))
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wakeup_w.send(b'x')
+        except OSError:
+            pass
+
+    # Everything below runs on the hub thread only
+
+    def _run(self):
+        while True:
+            for key, mask in self._selector.select(0.5):
+                if key.data is None:
+                    self._wakeup_r.recv(4096)  # Drain wakeup bytes
+                    continue
+                stream = key.data
+                try:
+                    self._service(stream)
+                except Exception as e:
+                    # _service runs the capture's publish path, which can
+                    # raise (GPU upload, shared-memory views gone after an
+                    # unlink). One bad capture must not take the shared loop
+                    # down with it, so retry just that stream.
+                    logger.warning(
+                        f"Hub error on stream {stream.capture.stream_id}: {e}")
+                    self._schedule_retry(stream)
+            self._apply_pending()
+            self._retry_due()
+
+    def _apply_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for item, add in pending:
+            if add:
+                self._streams[item.capture] = item
+                self._connect(item)
+            else:
+                stream = self._streams.pop(item, None)
+                if stream is not None:
+                    stream.closed = True
+                    self._close(stream)
+
+    def _connect(self, stream):
+        try:
+            sock = socket.socket()
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.connect_ex((stream.host, stream.port))
+            stream.sock = sock
+            stream.state = 'connecting'
+            stream.header_buf = b''
+            stream.offset = 0
+            self._selector.register(
+                sock, selectors.EVENT_READ | selectors.EVENT_WRITE, stream)
+        except OSError:
+            stream.sock = None
+            self._schedule_retry(stream)
+
+    def _close(self, stream):
+        if stream.sock is not None:
+            try:
+                self._selector.unregister(stream.sock)
+            except (KeyError, ValueError):
+                pass
+            stream.sock.close()
+            stream.sock = None
+
+    def _schedule_retry(self, stream):
+        self._close(stream)
+        stream.retry_at = time.monotonic() + stream.backoff
+        stream.backoff = min(stream.backoff * 2, 2.0)
+
+    def _retry_due(self):
+        now = time.monotonic()
+        for stream in self._streams.values():
+            if stream.sock is None and not stream.closed and stream.retry_at <= now:
+                self._connect(stream)
+
+    def _service(self, stream):
+        if stream.closed or stream.sock is None:
+            return
+
+        if stream.state == 'connecting':
+            if stream.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                self._schedule_retry(stream)
+                return
+            request = (f"GET {stream.path} HTTP/1.1\r\n"
+                       f"Host: {stream.host}:{stream.port}\r\n"
+                       "Connection: close\r\n\r\n").encode()
+            try:
+                stream.sock.send(request)
+            except OSError:
+                self._schedule_retry(stream)
+                return
+            stream.state = 'headers'
+            self._selector.modify(stream.sock, selectors.EVENT_READ, stream)
+            return
+
+        try:
+            data = stream.sock.recv(1 << 18)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._schedule_retry(stream)
+            return
+        if not data:
+            self._schedule_retry(stream)  # Server closed the connection
+            return
+
+        if stream.state == 'headers':
+            stream.header_buf += data
+            end = stream.header_buf.find(b'\r\n\r\n')
+            if end < 0:
+                if len(stream.header_buf) > 65536:
+                    self._schedule_retry(stream)
+                return
+            status = stream.header_buf[:end].split(None, 2)
+            if len(status) < 2 or status[1] != b'200':
+                self._schedule_retry(stream)
+                return
+            body = stream.header_buf[end + 4:]
+            stream.header_buf = b''
+            stream.state = 'body'
+            if body:
+                self._feed(stream, body)
+        else:
+            self._feed(stream, data)
+
+    def _feed(self, stream, data):
+        """Copy body bytes into the capture's write buffer, frame by frame"""
+        mv = memoryview(data)
+        while mv:
+            view = stream.views[stream.write_idx]
+            need = stream.frame_size - stream.offset
+            n = need if need < len(mv) else len(mv)
+            view[stream.offset:stream.offset + n] = mv[:n]
+            stream.offset += n
+            mv = mv[n:]
+            if stream.offset == stream.frame_size:
+                stream.capture._publish_frame(stream.write_idx)
+                stream.write_idx ^= 1
+                stream.offset = 0
+                stream.backoff = 0.05  # Frames are flowing again
+
 class SimpleVideoCapture:
     """Drop-in replacement for cv2.VideoCapture that uses RTSP server"""
-    
-    def __init__(self, rtsp_url, server_url="http://localhost:8091"):
+
+    # Streams started from this process, stream_id -> last-activity time
+    # (monotonic, so NTP steps can't skew the idle clock), paired with a
+    # min-heap of (expiry, stream_id) entries. cleanup_inactive_streams pops
+    # expired heap entries instead of scanning every stream.
+    _active_streams = {}
+    _expiry_heap = []
+
+    # How long a stream may sit untouched before cleanup stops it (seconds)
+    STREAM_IDLE_TIMEOUT = 300.0
+
+    # Shared-memory layout: 8-byte frame sequence + 8-byte timestamp header,
+    # then the HxWx3 pixel block
+    _SHM_HEADER_SIZE = 16
+
+    def __init__(self, rtsp_url, server_url="http://localhost:8091", gpu=False,
+                 shared=False, pin_memory=False):
         self.rtsp_url = rtsp_url
         self.server_url = server_url.rstrip('/')
         self.width = 640
         self.height = 480
-        self.frame_queue = Queue(maxsize=2)
+        # Latest-frame slot: current_frame is a single atomic reference store
+        # (wait-free for the consumer) and the event signals frame arrival,
+        # replacing the lock+condition dance of a queue.Queue per frame
         self.current_frame = None
+        self._frame_event = threading.Event()
+        self._stop_event = threading.Event()
         self.running = False
+
+        # Double-buffered frame storage: the fetcher fills one buffer while
+        # readers hold a stable reference to the other, so the steady-state
+        # frame path is a readinto with no per-frame allocation or copy.
+        # With pin_memory=True the buffers are carved out of page-locked
+        # torch tensors, so read_tensor()'s host-to-device copy is a single
+        # async DMA with no pageable->pinned staging pass.
+        self._pinned = None
+        if pin_memory:
+            try:
+                import torch
+                self._pinned = (
+                    torch.empty((self.height, self.width, 3),
+                                dtype=torch.uint8, pin_memory=True),
+                    torch.empty((self.height, self.width, 3),
+                                dtype=torch.uint8, pin_memory=True),
+                )
+                self._frame_bufs = tuple(t.numpy() for t in self._pinned)
+            except Exception as e:
+                logger.warning(f"Pinned memory unavailable, using pageable buffers: {e}")
+        if self._pinned is None:
+            self._frame_bufs = (
+                np.empty((self.height, self.width, 3), dtype=np.uint8),
+                np.empty((self.height, self.width, 3), dtype=np.uint8),
+            )
         self.session = requests.Session()
         self.session.timeout = (2, 5)
+
+        # Reuse one keep-alive connection per capture instead of paying a
+        # handshake per request
+        adapter = _TunedHTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
+        # Optional CUDA mirror of the latest frame, preallocated from a
+        # BufferPool so downstream GPU consumers never pay a per-frame
+        # cudaMalloc or an extra host-to-device staging copy
+        self._gpu = False
+        self._gpu_frame = None
+        self._gpu_stream = None
+        if gpu:
+            self._init_gpu()
+
+        # Optional shared-memory publication of the latest frame, so N
+        # consumer processes share one fetch thread and one 921 KB region
+        # instead of each running their own capture
+        self._shared = shared
+        self._shm = None
+        self._shm_owner = False
+        self._shm_seq = None
+        self._shm_ts = None
+        self._shm_frame = None
+
         # Generate stream ID from URL
-        hasher = hashlib.md5()
-        hasher.update(rtsp_url.encode())  # Fixed: use update() instead of Write()
-        self.stream_id = f"stream_{hasher.hexdigest()[:8]}"
-        
+        self.stream_id = _stream_id_for(rtsp_url)
+
         # Start the stream
         self._start_stream()
+
+    def _init_shared_memory(self):
+        """Create (or attach to) the shared latest-frame region
+
+        The region is named after the stream ID: a 16-byte header holding the
+        frame sequence number (uint64) and publish timestamp (float64),
+        followed by the pixel block. Readers attach with SharedFrameReader.
+        """
+        from multiprocessing import shared_memory
+
+        size = self._SHM_HEADER_SIZE + self.height * self.width * 3
+        try:
+            self._shm = shared_memory.SharedMemory(
+                name=self.stream_id, create=True, size=size)
+            self._shm_owner = True
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=self.stream_id)
+
+        buf = self._shm.buf
+        self._shm_seq = np.ndarray((1,), dtype=np.uint64, buffer=buf)
+        self._shm_ts = np.ndarray((1,), dtype=np.float64, buffer=buf, offset=8)
+        self._shm_frame = np.ndarray((self.height, self.width, 3),
+                                     dtype=np.uint8, buffer=buf,
+                                     offset=self._SHM_HEADER_SIZE)
+
+    def _init_gpu(self):
+        """Set up the CUDA upload path if OpenCV has CUDA support"""
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() < 1:
+                logger.warning("gpu=True requested but no CUDA device is available")
+                return
+            cv2.cuda.setBufferPoolUsage(True)
+            cv2.cuda.setBufferPoolConfig(cv2.cuda.getDevice(), 64 << 20, 2)
+            self._gpu_stream = cv2.cuda.Stream()
+            pool = cv2.cuda.BufferPool(self._gpu_stream)
+            self._gpu_frame = pool.getBuffer(self.height, self.width, cv2.CV_8UC3)
+            self._gpu = True
+        except (AttributeError, cv2.error) as e:
+            logger.warning(f"CUDA support unavailable, staying on CPU: {e}")
     
     def _start_stream(self):
         """Start stream on server"""
@@ -47,11 +481,19 @@ class SimpleVideoCapture:
             "height": self.height
         }
         
+        url = f"{self.server_url}/api/streams/start-with-url"
         try:
-            response = self.session.post(f"{self.server_url}/api/streams/start-with-url", json=payload)
+            if orjson is not None:
+                response = self.session.post(
+                    url, data=orjson.dumps(payload),
+                    headers={'Content-Type': 'application/json'})
+            else:
+                response = self.session.post(url, json=payload)
             if response.status_code == 200:
-                result = response.json()
+                result = (orjson.loads(response.content) if orjson is not None
+                          else response.json())
                 self.stream_id = result['stream_id']
+                SimpleVideoCapture._touch_stream(self.stream_id)
                 time.sleep(2)  # Wait for stream to start
                 self._start_fetching()
                 return True
@@ -63,197 +505,329 @@ class SimpleVideoCapture:
         return False
     
     def _start_fetching(self):
-        """Start background thread to fetch frames"""
+        """Start frame fetching via the shared hub (or a fallback thread)"""
+        if self._shared:
+            try:
+                self._init_shared_memory()
+            except Exception as e:
+                logger.warning(f"Shared memory unavailable for {self.stream_id}: {e}")
+                self._shm = None
+        self._stop_event.clear()
         self.running = True
+        # With the _frameio extension built, each stream gets its own thread
+        # parked in a C read(2) loop with the GIL released - no per-chunk
+        # Python dispatch and no contention with other captures. Otherwise one
+        # process-wide hub thread multiplexes all plain-HTTP streams, and a
+        # dedicated thread remains for anything the hub can't speak (HTTPS).
+        if _read_frame_into is not None and self.server_url.startswith('http://'):
+            self.fetch_thread = threading.Thread(
+                target=self._fetch_frames_c, daemon=True)
+            self.fetch_thread.start()
+            return
+        if _FetchHub.get().register(self):
+            self.fetch_thread = None
+            return
         self.fetch_thread = threading.Thread(target=self._fetch_frames, daemon=True)
         self.fetch_thread.start()
+
+    def _publish_frame(self, write_idx):
+        """Publish a filled frame buffer to readers (hub or thread path)"""
+        buf = self._frame_bufs[write_idx]
+        self.current_frame = buf
+        # Refresh the idle clock so cleanup_inactive_streams never mistakes a
+        # stream that is actively delivering frames for an abandoned one. A
+        # plain dict store only - heap entries are pushed at start/release.
+        SimpleVideoCapture._active_streams[self.stream_id] = time.monotonic()
+        if self._shm_frame is not None:
+            # Readers treat a sequence bump as frame-ready, so bump it last
+            self._shm_frame[...] = buf
+            self._shm_ts[0] = time.time()
+            self._shm_seq[0] += 1
+        if self._gpu:
+            self._gpu_frame.upload(buf, self._gpu_stream)
+        self._frame_event.set()
     
     def _fetch_frames(self):
-        """Fetch frames in background"""
+        """Fetch frames over a single long-lived streaming connection
+
+        The server's /stream endpoint sends raw BGR24 frames back-to-back,
+        so the hot loop is one exact-size read per frame instead of a full
+        HTTP request/response round-trip per frame.
+        """
+        # Bind everything the hot loop touches to locals up front: LOAD_FAST
+        # instead of repeated attribute lookups on self/np/session, and the
+        # flat byte views over the two buffers are built once, not per frame
+        url = f"{self.server_url}/api/streams/{self.stream_id}/stream"
+        http_get = self.session.get
+        bufs = self._frame_bufs
+        views = tuple(memoryview(buf).cast('B') for buf in bufs)
+        read_into = self._read_into
+        signal_frame = self._frame_event.set
+        write_idx = 0
+        gpu_frame = self._gpu_frame if self._gpu else None
+        gpu_stream = self._gpu_stream
+        shm_frame = self._shm_frame
+        shm_seq = self._shm_seq
+        shm_ts = self._shm_ts
+        now = time.time
+        active = SimpleVideoCapture._active_streams
+        stream_id = self.stream_id
+        monotonic = time.monotonic
+
+        # Failure sleeps back off exponentially (capped at 2 s) and go through
+        # the stop event, so release() interrupts them immediately instead of
+        # the thread hammering a down server 10x a second
+        stop_wait = self._stop_event.wait
+        backoff = 0.05
+
         while self.running:
             try:
-                response = self.session.get(
-                    f"{self.server_url}/api/streams/{self.stream_id}/frame",
-                    timeout=2
-                )
-                
-                if response.status_code == 200:
-                    frame_data = response.content
-                    expected_size = self.width * self.height * 3
-                    
-                    if len(frame_data) == expected_size:
-                        frame = np.frombuffer(frame_data, dtype=np.uint8)
-                        frame = frame.reshape((self.height, self.width, 3))
-                        
-                        self.current_frame = frame
-                        
-                        # Add to queue
-                        if self.frame_queue.full():
-                            try:
-                                self.frame_queue.get_nowait()
-                            except Empty:
-                                pass
-                        self.frame_queue.put(frame)
-                        
-                elif response.status_code == 204:
-                    # No frame available, just wait and retry
-                    time.sleep(0.1)
-    
+                response = http_get(url, stream=True, timeout=(2, None))
+                if response.status_code != 200:
+                    response.close()
+                    stop_wait(backoff)
+                    backoff = min(backoff * 2, 2.0)
+                    continue
+
+                raw = response.raw
+                while self.running:
+                    # Fill the write buffer in place, then flip buffers
+                    if not read_into(raw, views[write_idx]):
+                        break  # Server closed the connection, reconnect
+
+                    backoff = 0.05  # Frames are flowing again
+                    self.current_frame = bufs[write_idx]
+                    active[stream_id] = monotonic()  # Stream is in use
+                    if shm_frame is not None:
+                        # Publish to the shared region; readers treat a
+                        # sequence bump as frame-ready, so bump it last
+                        shm_frame[...] = bufs[write_idx]
+                        shm_ts[0] = now()
+                        shm_seq[0] += 1
+                    if gpu_frame is not None:
+                        # Async upload into the pooled GpuMat; the source
+                        # buffer isn't rewritten until a full flip later
+                        gpu_frame.upload(bufs[write_idx], gpu_stream)
+                    signal_frame()
+                    write_idx ^= 1
+
+                response.close()
+
             except Exception as e:
                 if self.running:
-                    time.sleep(0.1)
-    
+                    stop_wait(backoff)
+                    backoff = min(backoff * 2, 2.0)
+
+    @staticmethod
+    def _read_into(raw, view):
+        """Fill the whole view from the raw response; False on EOF"""
+        remaining = len(view)
+        while remaining > 0:
+            n = raw.readinto(view[-remaining:] if remaining < len(view) else view)
+            if not n:
+                return False
+            remaining -= n
+        return True
+
+    def _fetch_frames_c(self):
+        """Fetch frames with the _frameio C reader (plain-HTTP servers only)
+
+        Speaks the same minimal HTTP/1.1 as _FetchHub against the hijacked
+        /stream endpoint, but on a blocking socket: once the response headers
+        are consumed, every frame is one exact-size read(2) loop in C with
+        the GIL released for its whole duration.
+        """
+        parsed = urlparse(self.server_url)
+        host = parsed.hostname or 'localhost'
+        port = parsed.port or 80
+        request = (f"GET /api/streams/{self.stream_id}/stream HTTP/1.1\r\n"
+                   f"Host: {host}:{port}\r\n"
+                   "Connection: close\r\n\r\n").encode()
+        views = tuple(memoryview(buf).cast('B') for buf in self._frame_bufs)
+        frame_size = self.width * self.height * 3
+        read_frame = _read_frame_into
+        publish = self._publish_frame
+        write_idx = 0
+        stop_wait = self._stop_event.wait
+        backoff = 0.05
+
+        while self.running:
+            sock = None
+            try:
+                sock = socket.create_connection((host, port), timeout=2)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.sendall(request)
+
+                # Read just past the blank line ending the headers; anything
+                # that arrived with them is the start of the first frame
+                header_buf = b''
+                end = -1
+                while end < 0:
+                    data = sock.recv(4096)
+                    if not data or len(header_buf) > 65536:
+                        raise OSError("connection closed during headers")
+                    header_buf += data
+                    end = header_buf.find(b'\r\n\r\n')
+                status = header_buf[:end].split(None, 2)
+                if len(status) < 2 or status[1] != b'200':
+                    raise OSError(f"server refused stream: {header_buf[:end]!r}")
+
+                sock.settimeout(None)
+                fd = sock.fileno()
+                offset = 0
+                mv = memoryview(header_buf)[end + 4:]
+                while mv:
+                    # Same frame-slicing as _FetchHub._feed, for the (rare)
+                    # leftover bytes that came in with the headers
+                    n = min(frame_size - offset, len(mv))
+                    views[write_idx][offset:offset + n] = mv[:n]
+                    offset += n
+                    mv = mv[n:]
+                    if offset == frame_size:
+                        publish(write_idx)
+                        write_idx ^= 1
+                        offset = 0
+
+                while self.running:
+                    if not read_frame(fd, views[write_idx][offset:]):
+                        break  # Server closed the connection, reconnect
+                    backoff = 0.05  # Frames are flowing again
+                    publish(write_idx)
+                    write_idx ^= 1
+                    offset = 0
+            except Exception as e:
+                if self.running:
+                    logger.debug(f"Stream read error for {self.stream_id}: {e}")
+            finally:
+                if sock is not None:
+                    sock.close()
+            if self.running:
+                stop_wait(backoff)
+                backoff = min(backoff * 2, 2.0)
+
     def read(self):
         """Read a frame - same interface as cv2.VideoCapture"""
-        try:
-            frame = self.frame_queue.get(timeout=1.0)
-            return True, frame
-        except Empty:
-            if self.current_frame is not None:
-                return True, self.current_frame.copy()
-            return False, None
+        if self._frame_event.wait(timeout=1.0):
+            self._frame_event.clear()
+            return True, self.current_frame
+        # No fresh frame in time; fall back to the last one we saw. The
+        # reference is stable because the fetcher writes the other buffer.
+        if self.current_frame is not None:
+            return True, self.current_frame
+        return False, None
     
+    def read_tensor(self, device="cuda"):
+        """Read the latest frame as a torch tensor on the given device
+
+        With pin_memory=True the transfer is a single asynchronous
+        cudaMemcpyAsync straight out of the page-locked frame buffer.
+        Returns (ret, tensor) like read().
+        """
+        import torch
+        ret, frame = self.read()
+        if not ret:
+            return False, None
+        if self._pinned is not None and frame is self._frame_bufs[0]:
+            tensor = self._pinned[0]
+        elif self._pinned is not None and frame is self._frame_bufs[1]:
+            tensor = self._pinned[1]
+        else:
+            tensor = torch.from_numpy(frame)
+        return True, tensor.to(device, non_blocking=True)
+
+    def read_batch(self, n, out=None):
+        """Read n consecutive frames into one contiguous (n, H, W, 3) array
+
+        Downstream ML code usually wants a batch tensor, not n separate
+        arrays; filling rows of a single preallocated buffer means one
+        allocation (or none, with out=) and lets torch.from_numpy wrap the
+        whole batch as one contiguous block. Returns (ret, batch); ret is
+        False if a frame could not be read in time.
+        """
+        if out is None:
+            out = np.empty((n, self.height, self.width, 3), dtype=np.uint8)
+        for i in range(n):
+            ret, frame = self.read()
+            if not ret:
+                return False, out
+            out[i] = frame
+        return True, out
+
     def isOpened(self):
         """Check if capture is open - same interface as cv2.VideoCapture"""
-        return self.running
+        return self.running and self.current_frame is not None
+
+    @classmethod
+    def _touch_stream(cls, stream_id):
+        """Record activity on a stream and schedule its expiry check"""
+        now = time.monotonic()
+        cls._active_streams[stream_id] = now
+        heapq.heappush(cls._expiry_heap, (now + cls.STREAM_IDLE_TIMEOUT, stream_id))
+
+    @classmethod
+    def cleanup_inactive_streams(cls, server_url="http://localhost:8091"):
+        """Stop server-side streams idle for more than STREAM_IDLE_TIMEOUT
+
+        Expiry candidates come off the min-heap head, so only entries that
+        are actually due get looked at. The idle clock is refreshed on every
+        frame publish, so a capture that is actively reading never counts as
+        idle; a due entry for a refreshed stream is pushed back with the
+        updated expiry. Only streams started from this process are
+        considered, and the server refuses to stop a stream that still has
+        WebSocket clients or frame sinks attached.
+        """
+        now = time.monotonic()
+        heap = cls._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, stream_id = heapq.heappop(heap)
+            last_used = cls._active_streams.get(stream_id)
+            if last_used is None:
+                continue  # Already removed
+            if now - last_used < cls.STREAM_IDLE_TIMEOUT:
+                # Refreshed since this entry was pushed (frame publishes only
+                # update the dict); keep exactly one live entry for it
+                heapq.heappush(heap, (last_used + cls.STREAM_IDLE_TIMEOUT,
+                                      stream_id))
+                continue
+            try:
+                requests.delete(
+                    f"{server_url.rstrip('/')}/api/streams/{stream_id}",
+                    timeout=5
+                )
+            except Exception as e:
+                logger.warning(f"Failed to stop idle stream {stream_id}: {e}")
+            del cls._active_streams[stream_id]
     
     def get(self, prop_id):
         """Get property - same interface as cv2.VideoCapture"""
-        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
-            return float(self.width)
-        elif prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
-            return float(self.height)
-        elif prop_id == cv2.CAP_PROP_FPS:
-            return 30.0  # Default FPS
-        elif prop_id == cv2.CAP_PROP_BUFFERSIZE:
-            return float(self.frame_queue.maxsize)
-        elif prop_id == cv2.CAP_PROP_FRAME_COUNT:
-            return -1.0  # Infinite for live stream
-        elif prop_id == cv2.CAP_PROP_POS_FRAMES:
-            return 0.0   # Not applicable for live stream
-        elif prop_id == cv2.CAP_PROP_POS_MSEC:
-            return 0.0   # Not applicable for live stream
-        elif prop_id == cv2.CAP_PROP_POS_AVI_RATIO:
-            return 0.0   # Not applicable for live stream
-        elif prop_id == cv2.CAP_PROP_FOURCC:
-            return cv2.VideoWriter_fourcc('M', 'J', 'P', 'G')
-        elif prop_id == cv2.CAP_PROP_FORMAT:
-            return 16.0  # CV_8UC3
-        elif prop_id == cv2.CAP_PROP_MODE:
-            return 0.0   # Color mode
-        elif prop_id == cv2.CAP_PROP_BRIGHTNESS:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_CONTRAST:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_SATURATION:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_HUE:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_GAIN:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_EXPOSURE:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_CONVERT_RGB:
-            return 1.0   # We provide RGB frames
-        elif prop_id == cv2.CAP_PROP_WHITE_BALANCE_BLUE_U:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_RECTIFICATION:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_MONOCHROME:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_SHARPNESS:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_AUTO_EXPOSURE:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_GAMMA:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_TEMPERATURE:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_TRIGGER:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_TRIGGER_DELAY:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_WHITE_BALANCE_RED_V:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_ZOOM:
-            return 1.0
-        elif prop_id == cv2.CAP_PROP_FOCUS:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_GUID:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_ISO_SPEED:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_BACKLIGHT:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_PAN:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_TILT:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_ROLL:
-            return 0.0
-        elif prop_id == cv2.CAP_PROP_IRIS:
-            return 0.0
-        elif hasattr(cv2, 'CAP_PROP_SETTINGS') and prop_id == cv2.CAP_PROP_SETTINGS:
-            return 0.0
-        elif hasattr(cv2, 'CAP_PROP_AUTOFOCUS') and prop_id == cv2.CAP_PROP_AUTOFOCUS:
-            return 0.0
-        elif hasattr(cv2, 'CAP_PROP_CHANNEL') and prop_id == cv2.CAP_PROP_CHANNEL:
-            return 0.0
-        elif hasattr(cv2, 'CAP_PROP_AUTO_WB') and prop_id == cv2.CAP_PROP_AUTO_WB:
-            return 0.0
-        elif hasattr(cv2, 'CAP_PROP_WB_TEMPERATURE') and prop_id == cv2.CAP_PROP_WB_TEMPERATURE:
-            return 0.0
-        return 0.0
-    
+        getter = _PROP_GETTERS.get(prop_id)
+        return getter(self) if getter is not None else 0.0
+
     def set(self, prop_id, value):
         """Set property - same interface as cv2.VideoCapture"""
-        if prop_id == cv2.CAP_PROP_BUFFERSIZE:
-            # Adjust our queue size
-            try:
-                new_size = max(1, min(10, int(value)))
-                self.frame_queue = Queue(maxsize=new_size)
-                return True
-            except:
-                return False
-        elif prop_id == cv2.CAP_PROP_FPS:
-            # Can't really change FPS of server stream, but return True for compatibility
-            return True
-        elif prop_id == cv2.CAP_PROP_FRAME_WIDTH:
-            # Can't change resolution after stream started
-            return False
-        elif prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
-            # Can't change resolution after stream started
-            return False
-        elif prop_id == cv2.CAP_PROP_POS_FRAMES:
-            # Not applicable for live stream
-            return False
-        elif prop_id == cv2.CAP_PROP_POS_MSEC:
-            # Not applicable for live stream
-            return False
-        elif prop_id == cv2.CAP_PROP_POS_AVI_RATIO:
-            # Not applicable for live stream
-            return False
-        elif prop_id == cv2.CAP_PROP_FOURCC:
-            # Return True for compatibility but don't actually change
-            return True
-        elif prop_id in [cv2.CAP_PROP_BRIGHTNESS, cv2.CAP_PROP_CONTRAST, 
-                        cv2.CAP_PROP_SATURATION, cv2.CAP_PROP_HUE,
-                        cv2.CAP_PROP_GAIN, cv2.CAP_PROP_EXPOSURE,
-                        cv2.CAP_PROP_WHITE_BALANCE_BLUE_U, cv2.CAP_PROP_WHITE_BALANCE_RED_V,
-                        cv2.CAP_PROP_ZOOM, cv2.CAP_PROP_FOCUS, cv2.CAP_PROP_PAN, 
-                        cv2.CAP_PROP_TILT, cv2.CAP_PROP_ROLL, cv2.CAP_PROP_IRIS]:
-            # Camera control properties - return True for compatibility
-            return True
-        elif prop_id == cv2.CAP_PROP_CONVERT_RGB:
-            # Return True for compatibility
-            return True
-        return False
-    
+        return prop_id in _SETTABLE_PROPS
+
     def release(self):
         """Release capture - same interface as cv2.VideoCapture"""
         self.running = False
+        self._stop_event.set()  # Wake the fetch thread out of any backoff sleep
+        if _FetchHub._instance is not None:
+            _FetchHub._instance.unregister(self)
+        # Restart the idle clock; the server-side stream keeps running until
+        # cleanup_inactive_streams decides it has been unused long enough
+        if self.stream_id in SimpleVideoCapture._active_streams:
+            SimpleVideoCapture._touch_stream(self.stream_id)
         if hasattr(self, 'fetch_thread'):
             self.fetch_thread = None
+        # Unlink the shared region name if we created it; the memory itself
+        # lives on until every attached process detaches. The mapping is left
+        # open because the daemon fetch thread may still touch its views.
+        if self._shm is not None and self._shm_owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm_owner = False
     
     def grab(self):
         """Grab frame - same interface as cv2.VideoCapture"""
@@ -262,13 +836,19 @@ class SimpleVideoCapture:
     
     def retrieve(self, flag=0):
         """Retrieve frame - same interface as cv2.VideoCapture"""
-        try:
-            if self.current_frame is not None:
-                return True, self.current_frame.copy()
-            frame = self.frame_queue.get_nowait()
-            return True, frame
-        except Empty:
+        if self.current_frame is not None:
+            return True, self.current_frame
+        return False, None
+
+    def retrieve_gpu(self):
+        """Retrieve the latest frame as a cv2.cuda_GpuMat (requires gpu=True)
+
+        The frame stays resident on the device; call download() only when a
+        CPU copy is actually needed.
+        """
+        if not self._gpu or self.current_frame is None:
             return False, None
+        return True, self._gpu_frame
     
     def getBackendName(self):
         """Get backend name - same interface as cv2.VideoCapture"""
@@ -302,17 +882,56 @@ class SimpleVideoCapture:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.release()
 
+class SharedFrameReader:
+    """Reader side of a SimpleVideoCapture(shared=True) frame region
+
+    Attaches to the shared-memory region by stream ID, so any number of
+    processes can consume one capture's frames without their own fetch
+    threads. read() hands out views into shared memory - copy the frame
+    before mutating it or keeping it across reads.
+    """
+
+    def __init__(self, stream_id, width=640, height=480):
+        from multiprocessing import shared_memory
+
+        self._shm = shared_memory.SharedMemory(name=stream_id)
+        buf = self._shm.buf
+        self._seq = np.ndarray((1,), dtype=np.uint64, buffer=buf)
+        self._ts = np.ndarray((1,), dtype=np.float64, buffer=buf, offset=8)
+        self._frame = np.ndarray(
+            (height, width, 3), dtype=np.uint8, buffer=buf,
+            offset=SimpleVideoCapture._SHM_HEADER_SIZE)
+        self._last_seq = int(self._seq[0])
+
+    def read(self, timeout=1.0):
+        """Wait up to timeout seconds for a frame newer than the last one"""
+        deadline = time.time() + timeout
+        while True:
+            seq = int(self._seq[0])
+            if seq != self._last_seq:
+                self._last_seq = seq
+                return True, self._frame
+            if time.time() >= deadline:
+                return False, None
+            time.sleep(0.001)
+
+    def close(self):
+        self._shm.close()
+
+# Matches RTSP URL schemes, including TLS (rtsps://); compiled once at import
+_RTSP_URL = re.compile(r'^rtsps?://').match
+
 # The main function you'll import
 def VideoCapture(source):
     """
     Drop-in replacement for cv2.VideoCapture
-    
+
     Usage:
         from video_import import VideoCapture
         cap = VideoCapture("rtsp://camera-url")
         ret, frame = cap.read()
     """
-    if isinstance(source, str) and source.startswith('rtsp://'):
+    if isinstance(source, str) and _RTSP_URL(source):
         return SimpleVideoCapture(source)
     else:
         # For non-RTSP sources, use regular OpenCV